@@ -1,14 +1,32 @@
 import os
+import asyncio
+import contextlib
+import ctypes
+import errno
+import hashlib
+import itertools
 import logging
+import mmap
+import queue
+import re
+import stat
+import sys
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, status
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from pydantic import BaseModel
 import json
+import msgspec
 
 # Configure logging
 logging.basicConfig(
@@ -16,24 +34,90 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
-
-# Configuration from environment variables
-API_URL = os.getenv("API_URL", "http://localhost:8000")
-ALLOWED_ORIGINS = os.getenv(
-    "ALLOWED_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173"
-).split(",")
-MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE_MB", "50")) * 1024 * 1024  # 50MB default
+# Per-request access lines cost more than they tell us; errors still get logged
+logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 
 # Get the directory where this script is located (backend directory)
 BACKEND_DIR = Path(__file__).parent.resolve()
-# Make RECORDINGS_DIR absolute - resolve relative to backend directory
-recordings_path = os.getenv("RECORDINGS_DIR", "recordings")
-RECORDINGS_DIR = (BACKEND_DIR / recordings_path).resolve() if not Path(recordings_path).is_absolute() else Path(recordings_path)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Configuration read once from environment variables at startup"""
+    api_url: str
+    allowed_origins: tuple[str, ...]
+    max_file_size: int
+    recordings_dir: Path
+    transcription_flush_interval: float
+    recordings_cache_ttl: float
+    worker_id: str
+
+
+def _load_settings() -> Settings:
+    """Build Settings from environment variables"""
+    # Make the recordings directory absolute - resolve relative to backend directory
+    recordings_path = Path(os.getenv("RECORDINGS_DIR", "recordings"))
+    if not recordings_path.is_absolute():
+        recordings_path = (BACKEND_DIR / recordings_path).resolve()
+
+    origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173")
+
+    return Settings(
+        api_url=os.getenv("API_URL", "http://localhost:8000"),
+        # Strip whitespace so "a, b" lists still match request origins exactly
+        allowed_origins=tuple(o.strip() for o in origins.split(",") if o.strip()),
+        max_file_size=int(os.getenv("MAX_FILE_SIZE_MB", "50")) * 1024 * 1024,  # 50MB default
+        recordings_dir=recordings_path,
+        transcription_flush_interval=int(os.getenv("TRANSCRIPTION_FLUSH_INTERVAL_MS", "500")) / 1000,
+        recordings_cache_ttl=float(os.getenv("RECORDINGS_CACHE_TTL_SECONDS", "2")),
+        worker_id=os.getenv("WORKER_ID", "0"),
+    )
+
+
+settings = _load_settings()
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB read/write chunks for streamed uploads
+# Allowed file extensions (lowercase), as tuples for str.endswith
+ALLOWED_AUDIO_EXTENSIONS = (".webm", ".opus", ".ogg", ".wav", ".m4a")
+ALLOWED_UPLOAD_EXTENSIONS = ALLOWED_AUDIO_EXTENSIONS + (".txt",)
+# Error details that only depend on configuration, built once
+INVALID_UPLOAD_TYPE_DETAIL = f"Invalid file type. Allowed: {', '.join(ALLOWED_UPLOAD_EXTENSIONS)}"
+FILE_TOO_LARGE_DETAIL = f"File too large. Maximum size: {settings.max_file_size / (1024 * 1024):.1f}MB"
+# Matches "..", "/" or a backslash anywhere in a requested filename (path traversal)
+_INVALID_FILENAME_RE = re.compile(r"\.\.|[/\\]")
+# Session ids become log filenames, so only allow short names without path separators
+_SESSION_ID_RE = re.compile(r"[A-Za-z0-9._-]{1,128}")
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB chunks when serving recordings
+
+# Prefix for displaying saved files relative to the backend directory
+try:
+    _recordings_rel = settings.recordings_dir.relative_to(BACKEND_DIR)
+    _RECORDINGS_DISPLAY_PREFIX = f"{_recordings_rel}{os.sep}" if _recordings_rel.parts else ""
+except ValueError:
+    # If paths can't be made relative, just use the filename
+    _RECORDINGS_DISPLAY_PREFIX = ""
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the session log flusher for the lifetime of the app"""
+    flush_task = asyncio.create_task(_flush_session_logs_periodically())
+    try:
+        yield
+    finally:
+        flush_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await flush_task
+        # Drain anything queued since the last flush before exiting
+        await run_in_threadpool(_flush_session_logs)
+
 
 app = FastAPI(
     title="VAD WebRTC Recorder Backend",
     description="Backend API for VAD-based audio recording",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Security: Trusted Host Middleware
@@ -45,16 +129,373 @@ app.add_middleware(
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=ALLOWED_ORIGINS,
+    allow_origins=list(settings.allowed_origins),
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["*"],
     max_age=3600,
 )
 
-# Ensure recordings directory exists
-RECORDINGS_DIR.mkdir(parents=True, exist_ok=True)
-logger.info(f"Recordings directory: {RECORDINGS_DIR}")
+# Ensure recordings directory exists; endpoints rely on it for the process lifetime
+settings.recordings_dir.mkdir(parents=True, exist_ok=True)
+# Only worker 0 logs startup details; WORKER_ID must be set per worker (see README) for this to dedupe
+if settings.worker_id == "0":
+    logger.info(f"Recordings directory: {settings.recordings_dir}")
+
+# Monotonic suffix for upload filenames
+_upload_counter = itertools.count()
+
+# Pool of reusable copy buffers for uploads, grown on demand up to peak concurrency
+_upload_buffers: "queue.SimpleQueue[bytearray]" = queue.SimpleQueue()
+
+# (unix second, formatted UTC timestamp) so log entries format at most once per second
+_log_timestamp_cache: tuple[int, str] = (-1, "")
+
+# Cached .webm listing as (filename, size, mtime), newest first
+_recordings_cache: list[tuple[str, int, float]] = []
+_recordings_cache_expires = 0.0
+# Guards both cache writers: rescans from the threadpool and newly saved uploads
+_recordings_cache_lock = threading.Lock()
+
+# Session log entries waiting to be flushed, keyed by session_id
+_pending_log_entries: dict[str, list[str]] = {}
+_pending_log_lock = threading.Lock()
+# Consecutive failed flushes per session, guarded by _pending_log_lock
+_log_flush_failures: dict[str, int] = {}
+# Write errors worth retrying on the next flush; anything else will never succeed
+_TRANSIENT_LOG_ERRNOS = frozenset({errno.EIO, errno.ENOSPC, errno.EAGAIN})
+# Give up on a session's queued entries after this many failed flushes in a row
+MAX_LOG_FLUSH_RETRIES = 20
+# Serializes flushes so entries for a session are always written in order
+_log_flush_lock = threading.Lock()
+
+
+def _log_timestamp() -> str:
+    """Current UTC time formatted for session log entries, cached per second"""
+    global _log_timestamp_cache
+    now = int(time.time())
+    second, formatted = _log_timestamp_cache
+    if now != second:
+        formatted = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(now))
+        _log_timestamp_cache = (now, formatted)
+    return formatted
+
+
+def _scan_recordings() -> list[tuple[str, int, float]]:
+    """Scan the recordings directory for .webm files, newest first"""
+    recordings = []
+    with os.scandir(settings.recordings_dir) as it:
+        for entry in it:
+            # is_file() uses the d_type from the directory listing, no extra stat
+            if entry.name.endswith(".webm") and entry.is_file(follow_symlinks=False):
+                entry_stat = entry.stat(follow_symlinks=False)
+                recordings.append((entry.name, entry_stat.st_size, entry_stat.st_mtime))
+    recordings.sort(key=lambda r: r[2], reverse=True)
+    return recordings
+
+
+def _get_recordings() -> list[tuple[str, int, float]]:
+    """Return the cached recordings listing, rescanning once it is older than settings.recordings_cache_ttl"""
+    global _recordings_cache, _recordings_cache_expires
+    with _recordings_cache_lock:
+        now = time.monotonic()
+        if now >= _recordings_cache_expires:
+            _recordings_cache = _scan_recordings()
+            _recordings_cache_expires = now + settings.recordings_cache_ttl
+        return _recordings_cache
+
+
+def _add_cached_recordings(saved: list[tuple[Path, int, float]]) -> None:
+    """
+    Add freshly saved (path, size, mtime) recordings to the cached listing without a rescan.
+    
+    A rescan while the upload was still being written may already list it,
+    so entries with the same name are replaced rather than duplicated.
+    """
+    global _recordings_cache
+    added = [(path.name, size, mtime) for path, size, mtime in saved if path.suffix == ".webm"]
+    if added:
+        names = {name for name, _, _ in added}
+        with _recordings_cache_lock:
+            _recordings_cache = added[::-1] + [r for r in _recordings_cache if r[0] not in names]
+
+
+def _remove_uploads(paths: list[Path]) -> None:
+    """Delete rejected upload files and drop any that a rescan already cached"""
+    global _recordings_cache
+    for path in paths:
+        path.unlink(missing_ok=True)
+    names = {path.name for path in paths}
+    with _recordings_cache_lock:
+        _recordings_cache = [r for r in _recordings_cache if r[0] not in names]
+
+
+def _append_session_log(session_log_path: Path, log_entry: str) -> bool:
+    """
+    Append text to a session log file with O_APPEND writes.
+    
+    Returns True if the file was created. O_EXCL on the first open detects
+    creation without a separate exists() check.
+    """
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    try:
+        fd = os.open(session_log_path, flags | os.O_EXCL, 0o644)
+        created = True
+    except FileExistsError:
+        fd = os.open(session_log_path, flags)
+        created = False
+    try:
+        data = memoryview(log_entry.encode("utf-8"))
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+    return created
+
+
+def _count_entries_in_text(text: str) -> int:
+    """Count entries (lines starting with "[") in a chunk of session log text"""
+    return text.startswith("[") + text.count("\n[")
+
+
+def _count_log_entries(path: str) -> tuple[int, int]:
+    """
+    Count entries (lines starting with "[") in a session log.
+    
+    The file is memory-mapped and scanned with find(), so it is never split
+    into Python lines. Returns the entry count and the number of bytes scanned.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return 0, 0
+    with mm:
+        entry_count = 1 if mm[:1] == b"[" else 0
+        pos = mm.find(b"\n[")
+        while pos != -1:
+            entry_count += 1
+            pos = mm.find(b"\n[", pos + 2)
+        return entry_count, len(mm)
+
+
+def _read_first_line(path: str) -> str:
+    """Return the first line of a log file, stripped"""
+    with open(path, "rb") as f:
+        line = f.readline()
+    return line.decode("utf-8").strip() if line else "No entries"
+
+
+def _entry_count_index_path(session_log_path: str) -> str:
+    """Path of the .idx sidecar holding a session log's entry count"""
+    return os.path.splitext(session_log_path)[0] + ".idx"
+
+
+def _read_entry_count_index(session_log_path: str) -> Optional[tuple[int, int]]:
+    """
+    Read (entry count, log size) from a session log's .idx sidecar.
+    
+    The count is only valid for a log of exactly that size. Returns None when
+    the index is missing or unreadable.
+    """
+    try:
+        with open(_entry_count_index_path(session_log_path), "rb") as f:
+            count, size = f.read().split()
+        return int(count), int(size)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _session_log_entry_count(session_log_path: str, log_size: int) -> int:
+    """Entry count from the .idx sidecar, scanning the log when the index does not match its size"""
+    index = _read_entry_count_index(session_log_path)
+    if index is not None and index[1] == log_size:
+        return index[0]
+    return _count_log_entries(session_log_path)[0]
+
+
+def _update_entry_count_index(session_log_path: str, appended: str, created: bool) -> None:
+    """
+    Bring the session log's .idx sidecar up to date after an append.
+    
+    The stored count is only advanced when the index matched the log right
+    before this append. Otherwise (another worker appended concurrently, or the
+    log was replaced) the log is rescanned, so the index never drifts.
+    """
+    index_path = _entry_count_index_path(session_log_path)
+    appended_count = _count_entries_in_text(appended)
+    appended_size = len(appended.encode("utf-8"))
+    log_size = os.stat(session_log_path).st_size
+
+    index = None if created else _read_entry_count_index(session_log_path)
+    if created and log_size == appended_size:
+        # A brand new log holds only this append; any existing index is stale
+        count, size = appended_count, log_size
+    elif index is not None and index[1] + appended_size == log_size:
+        count, size = index[0] + appended_count, log_size
+    else:
+        count, size = _count_log_entries(session_log_path)
+
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(f"{count} {size}".encode("ascii"))
+    os.replace(tmp_path, index_path)
+
+
+def _queue_session_log_entry(session_id: str, log_entry: str) -> None:
+    """Queue an entry to be appended to a session log on the next flush"""
+    with _pending_log_lock:
+        _pending_log_entries.setdefault(session_id, []).append(log_entry)
+
+
+def _flush_session_logs(session_id: Optional[str] = None) -> None:
+    """
+    Append queued entries to their session log files, one write per session.
+    
+    Flushes every session, or only session_id when given. Entries that hit a
+    transient write error are re-queued for the next flush, up to
+    MAX_LOG_FLUSH_RETRIES times; any other error drops them.
+    """
+    with _log_flush_lock:
+        with _pending_log_lock:
+            if session_id is None:
+                pending = dict(_pending_log_entries)
+                _pending_log_entries.clear()
+            elif session_id in _pending_log_entries:
+                pending = {session_id: _pending_log_entries.pop(session_id)}
+            else:
+                return
+
+        for sid, entries in pending.items():
+            session_log_path = settings.recordings_dir / f"{sid}.txt"
+            appended = "".join(entries)
+            try:
+                created = _append_session_log(session_log_path, appended)
+                if created:
+                    logger.info(f"Created new session log file: {session_log_path}")
+            except Exception as e:
+                transient = isinstance(e, OSError) and e.errno in _TRANSIENT_LOG_ERRNOS
+                with _pending_log_lock:
+                    failures = _log_flush_failures.pop(sid, 0) + 1
+                    if transient and failures <= MAX_LOG_FLUSH_RETRIES:
+                        _log_flush_failures[sid] = failures
+                        _pending_log_entries[sid] = entries + _pending_log_entries.get(sid, [])
+                        retrying = True
+                    else:
+                        retrying = False
+                # Retried every flush while the disk is failing; only format tracebacks when debugging
+                logger.error(
+                    f"Failed to write session log {session_log_path.name}: {e}"
+                    + ("; will retry" if retrying else f"; dropping {len(entries)} entries"),
+                    exc_info=logger.isEnabledFor(logging.DEBUG),
+                )
+                continue
+
+            if sid in _log_flush_failures:
+                with _pending_log_lock:
+                    _log_flush_failures.pop(sid, None)
+
+            try:
+                _update_entry_count_index(str(session_log_path), appended, created)
+            except Exception as e:
+                # Drop the stale index so listings fall back to scanning the log
+                logger.warning(f"Failed to update entry count index for {session_log_path.name}: {e}")
+                with contextlib.suppress(OSError):
+                    os.unlink(_entry_count_index_path(str(session_log_path)))
+
+
+async def _flush_session_logs_periodically() -> None:
+    """Flush queued session log entries every settings.transcription_flush_interval seconds"""
+    while True:
+        await asyncio.sleep(settings.transcription_flush_interval)
+        await run_in_threadpool(_flush_session_logs)
+
+
+# fdatasync skips flushing metadata such as mtime; not available on every platform
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _load_syncfs():
+    """Linux syncfs(2) from libc, or None where it is unavailable"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return ctypes.CDLL(None, use_errno=True).syncfs
+    except (OSError, AttributeError):
+        return None
+
+
+# Flushes one filesystem in a single call, so a batch needs no per-file syncs
+_syncfs = _load_syncfs()
+
+
+def _acquire_upload_buffer() -> bytearray:
+    """Take a copy buffer from the pool, allocating a new one if none are free"""
+    try:
+        return _upload_buffers.get_nowait()
+    except queue.Empty:
+        return bytearray(UPLOAD_CHUNK_SIZE)
+
+
+def _release_upload_buffer(buffer: bytearray) -> None:
+    """Return a copy buffer to the pool"""
+    _upload_buffers.put(buffer)
+
+
+def _copy_upload(
+    src, dst, buffer: bytearray, expected_size: Optional[int] = None, sync: bool = False
+) -> tuple[int, str, float]:
+    """
+    Copy an upload's spooled file into dst through a reusable buffer.
+    
+    When expected_size is known the output is preallocated in one call so the
+    filesystem can reserve contiguous blocks instead of extending per write.
+    With sync, the output's data is flushed to stable storage before returning.
+    Returns the number of bytes copied, their SHA-256 hex digest and the
+    output's mtime.
+    Raises HTTPException once the upload exceeds settings.max_file_size.
+    """
+    preallocated = 0
+    if expected_size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(dst.fileno(), 0, expected_size)
+            preallocated = expected_size
+        except OSError:
+            # Not supported by every filesystem; fall back to growing on write
+            pass
+
+    # SpooledTemporaryFile only gained readinto() in Python 3.11
+    readinto = getattr(src, "readinto", None) or src._file.readinto
+    view = memoryview(buffer)
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        try:
+            n = readinto(view)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to read file: {str(e)}",
+            )
+        if not n:
+            if size < preallocated:
+                dst.truncate(size)
+            dst.flush()
+            if sync:
+                _fdatasync(dst.fileno())
+            return size, digest.hexdigest(), os.fstat(dst.fileno()).st_mtime
+
+        # Validate file size
+        size += n
+        if size > settings.max_file_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=FILE_TOO_LARGE_DETAIL,
+            )
+        chunk = view[:n]
+        digest.update(chunk)
+        dst.write(chunk)
 
 
 class HealthResponse(BaseModel):
@@ -63,135 +504,260 @@ class HealthResponse(BaseModel):
     recordings_count: int
 
 
-class TranscriptionRequest(BaseModel):
+class TranscriptionRequest(msgspec.Struct):
     text: str
     session_id: str
 
 
+# Validates and decodes /transcription bodies in a single pass
+_transcription_decoder = msgspec.json.Decoder(TranscriptionRequest)
+
+# /transcription reads its raw body, so describe it for the OpenAPI docs by hand
+def _transcription_request_schema() -> dict:
+    """JSON schema of TranscriptionRequest for the OpenAPI docs, plus the session_id pattern"""
+    schema = msgspec.json.schema(TranscriptionRequest)["$defs"][TranscriptionRequest.__name__]
+    schema["properties"]["session_id"]["pattern"] = f"^{_SESSION_ID_RE.pattern}$"
+    return schema
+
+
+_TRANSCRIPTION_OPENAPI_EXTRA = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": _transcription_request_schema()}},
+    },
+}
+
+
+def _is_json_content_type(content_type: Optional[str]) -> bool:
+    """
+    Whether a request with this Content-Type may be parsed as JSON.
+    
+    Mirrors FastAPI's body handling: a missing header, application/json or
+    application/*+json. Anything else (e.g. text/plain, which browsers send
+    cross-origin without a CORS preflight) is rejected.
+    """
+    if not content_type:
+        return True
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    maintype, _, subtype = media_type.partition("/")
+    return maintype == "application" and (subtype == "json" or subtype.endswith("+json"))
+
+
+class RecordingFileResponse(FileResponse):
+    """
+    FileResponse for serving recordings.
+    
+    Servers that support the ASGI pathsend extension send the file straight
+    from disk; otherwise it is streamed in DOWNLOAD_CHUNK_SIZE chunks rather
+    than Starlette's 64KB default to cut per-chunk read/send overhead.
+    """
+    chunk_size = DOWNLOAD_CHUNK_SIZE
+
+
 @app.get("/health", response_model=HealthResponse)
-async def health():
+def health():
     """Health check endpoint"""
-    recordings_count = len(list(RECORDINGS_DIR.glob("*.webm"))) if RECORDINGS_DIR.exists() else 0
     return {
         "status": "ok",
         "version": "1.0.0",
-        "recordings_count": recordings_count,
+        "recordings_count": len(_get_recordings()),
     }
 
 
-@app.post("/upload")
-async def upload_audio(file: UploadFile = File(...)):
+async def _save_upload(file: UploadFile, sync: bool = False) -> tuple[Path, int, str, float]:
     """
-    Receive a single audio file (e.g. webm/opus) and save it to disk.
+    Validate an uploaded file and stream it into the recordings directory.
     
-    - Validates file size
-    - Validates file extension
-    - Saves to recordings directory with timestamp
+    Returns the saved path, its size, its SHA-256 hex digest and its mtime. Nothing is
+    left on disk if the upload is rejected. With sync, the file's data is on
+    stable storage before this returns.
     """
     # Validate file extension
-    allowed_extensions = {".webm", ".opus", ".ogg", ".wav", ".m4a", ".txt"}
-    file_ext = Path(file.filename or "").suffix.lower()
-    
-    if file_ext not in allowed_extensions:
+    upload_name = (file.filename or "").lower()
+    if not upload_name.endswith(ALLOWED_UPLOAD_EXTENSIONS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}",
+            detail=INVALID_UPLOAD_TYPE_DETAIL,
         )
+    file_ext = upload_name[upload_name.rfind("."):]
 
-    # Read file content
-    try:
-        contents = await file.read()
-    except Exception as e:
+    # Generate a unique filename: nanosecond timestamp plus a per-process counter
+    # so bursts of uploads within the same clock tick cannot collide
+    out_path = settings.recordings_dir / f"recording-{time.time_ns():x}-{next(_upload_counter):x}{file_ext}"
+
+    # Reject oversized uploads before touching disk when the size is already known
+    if file.size is not None and file.size > settings.max_file_size:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to read file: {str(e)}",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=FILE_TOO_LARGE_DETAIL,
         )
 
-    # Validate file size
-    if len(contents) > MAX_FILE_SIZE:
+    # Stream the upload to disk in chunks so the whole file is never held in memory
+    buffer = _acquire_upload_buffer()
+    try:
+        with out_path.open("xb") as out:
+            size, sha256, mtime = await run_in_threadpool(_copy_upload, file.file, out, buffer, file.size, sync)
+    except HTTPException:
+        await run_in_threadpool(_remove_uploads, [out_path])
+        raise
+    except Exception as e:
+        await run_in_threadpool(_remove_uploads, [out_path])
         raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File too large. Maximum size: {MAX_FILE_SIZE / (1024 * 1024):.1f}MB",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save file: {str(e)}",
         )
+    finally:
+        _release_upload_buffer(buffer)
 
-    if len(contents) == 0:
+    if size == 0:
+        await run_in_threadpool(_remove_uploads, [out_path])
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File is empty",
         )
 
-    # Generate filename with timestamp
-    timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S-%f")
-    out_path = RECORDINGS_DIR / f"recording-{timestamp}{file_ext}"
+    return out_path, size, sha256, mtime
+
+
+def _upload_result(out_path: Path, size: int, sha256: str) -> dict:
+    """Response fields describing a saved upload"""
+    return {
+        "filename": out_path.name,
+        "size": size,
+        "sha256": sha256,
+        "path": _RECORDINGS_DISPLAY_PREFIX + out_path.name,
+    }
+
 
+def _sync_recordings_dir() -> None:
+    """
+    Make files written to the recordings directory durable.
+    
+    On Linux a single syncfs() flushes the recordings filesystem, covering the
+    data and directory entries of every file in a batch. Elsewhere callers
+    must have synced each file already; only the directory is fsynced here.
+    """
     try:
-        # Write file to disk
-        out_path.write_bytes(contents)
-        
-        # Return relative path from backend directory for display
-        try:
-            relative_path = str(out_path.relative_to(BACKEND_DIR))
-        except ValueError:
-            # If paths can't be made relative, just use the filename
-            relative_path = out_path.name
-        
-        return JSONResponse({
-            "status": "ok",
-            "filename": out_path.name,
-            "size": len(contents),
-            "path": relative_path,
-        })
+        fd = os.open(settings.recordings_dir, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened for fsync on every platform (e.g. Windows)
+        return
+    try:
+        if _syncfs is not None:
+            if _syncfs(fd) != 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err))
+        else:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@app.post("/upload")
+async def upload_audio(file: UploadFile = File(...)):
+    """
+    Receive a single audio file (e.g. webm/opus) and save it to disk.
+    
+    - Validates file size
+    - Validates file extension
+    - Saves to recordings directory with timestamp
+    """
+    out_path, size, sha256, mtime = await _save_upload(file)
+    await run_in_threadpool(_add_cached_recordings, [(out_path, size, mtime)])
+    return {"status": "ok", **_upload_result(out_path, size, sha256)}
+
+
+@app.post("/upload-batch")
+async def upload_batch(files: list[UploadFile] = File(...)):
+    """
+    Receive several audio files in one request and save them to disk.
+    
+    - Validates each file like /upload
+    - Makes the whole batch durable with one sync before responding
+    - All-or-nothing: if any file is rejected, none of the batch is kept
+    """
+    saved: list[tuple[Path, int, str, float]] = []
+    try:
+        for file in files:
+            # Without syncfs each file's data has to be synced on its own descriptor
+            saved.append(await _save_upload(file, sync=_syncfs is None))
+        await run_in_threadpool(_sync_recordings_dir)
+    except HTTPException:
+        await run_in_threadpool(_remove_uploads, [out_path for out_path, _, _, _ in saved])
+        raise
     except Exception as e:
+        await run_in_threadpool(_remove_uploads, [out_path for out_path, _, _, _ in saved])
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save file: {str(e)}",
+            detail=f"Failed to save files: {str(e)}",
         )
 
+    await run_in_threadpool(_add_cached_recordings, [(out_path, size, mtime) for out_path, size, _, mtime in saved])
+
+    return {
+        "status": "ok",
+        "files": [_upload_result(out_path, size, sha256) for out_path, size, sha256, _ in saved],
+    }
+
 
-@app.post("/transcription")
-async def save_transcription(request: TranscriptionRequest):
+@app.post("/transcription", status_code=status.HTTP_202_ACCEPTED, openapi_extra=_TRANSCRIPTION_OPENAPI_EXTRA)
+async def save_transcription(http_request: Request):
     """
-    Receive transcription text and append it to a session log file.
+    Receive transcription text and queue it for the session log file.
     
+    - Validates the JSON body against TranscriptionRequest
     - Creates/updates a session log file per session_id
     - Appends transcription with timestamp
-    - Saves to recordings directory
+    - Entries are batched and written to the recordings directory periodically
     """
+    if not _is_json_content_type(http_request.headers.get("content-type")):
+        raise RequestValidationError(
+            [{"type": "value_error", "loc": ("body",), "msg": "Content-Type must be application/json", "input": None}]
+        )
+
+    try:
+        request = _transcription_decoder.decode(await http_request.body())
+    except msgspec.DecodeError as e:
+        # Same 422 detail list FastAPI produces for its own body validation
+        raise RequestValidationError(
+            [{"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}]
+        )
+
+    # Reject ids that could never be written (or would escape the recordings
+    # directory) now, since the write itself happens after we return 202
+    if not _SESSION_ID_RE.fullmatch(request.session_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid session_id. Use 1-128 letters, digits, '.', '_' or '-'",
+        )
+
     try:
         # Create session log file path
-        session_log_path = RECORDINGS_DIR / f"{request.session_id}.txt"
+        session_log_path = settings.recordings_dir / f"{request.session_id}.txt"
         
         # Prepare log entry with timestamp
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-        log_entry = f"[{timestamp}]\n{request.text}\n\n"
-        
-        # Check if file exists (to log if it's a new file or append)
-        file_exists = session_log_path.exists()
+        log_entry = f"[{_log_timestamp()}]\n{request.text}\n\n"
         
-        # Append to session log file
-        with open(session_log_path, "a", encoding="utf-8") as f:
-            f.write(log_entry)
+        # Queue for the next batched append to the session log file
+        _queue_session_log_entry(request.session_id, log_entry)
         
         # Log to console
         text_preview = request.text[:100] + "..." if len(request.text) > 100 else request.text
         logger.info(
-            f"Transcription saved - Session: {request.session_id}, "
+            f"Transcription queued - Session: {request.session_id}, "
             f"File: {session_log_path.name}, "
             f"Text length: {len(request.text)} chars, "
             f"Preview: {text_preview}"
         )
         
-        if not file_exists:
-            logger.info(f"Created new session log file: {session_log_path}")
-        
-        return JSONResponse({
+        return {
             "status": "ok",
-            "message": f"Transcription saved to session log",
+            "message": "Transcription queued for session log",
             "session_id": request.session_id,
             "log_file": session_log_path.name,
             "log_path": str(session_log_path),
             "text_length": len(request.text),
-        })
+        }
     except Exception as e:
         logger.error(f"Failed to save transcription: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -201,59 +767,45 @@ async def save_transcription(request: TranscriptionRequest):
 
 
 @app.get("/recordings")
-async def list_recordings(limit: int = 10):
+def list_recordings(limit: int = 10):
     """List recent recordings"""
-    if not RECORDINGS_DIR.exists():
-        return {"recordings": []}
-    
-    recordings = sorted(
-        RECORDINGS_DIR.glob("*.webm"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )[:limit]
-    
     return {
         "recordings": [
             {
-                "filename": r.name,
-                "size": r.stat().st_size,
-                "modified": datetime.fromtimestamp(r.stat().st_mtime).isoformat(),
+                "filename": filename,
+                "size": size,
+                "modified": datetime.fromtimestamp(mtime).isoformat(),
             }
-            for r in recordings
+            for filename, size, mtime in _get_recordings()[:limit]
         ]
     }
 
 
 @app.get("/transcription-logs")
-async def list_transcription_logs():
+def list_transcription_logs():
     """List all transcription log files (session .txt files)"""
-    if not RECORDINGS_DIR.exists():
-        return {"logs": []}
-    
-    log_files = sorted(
-        RECORDINGS_DIR.glob("*.txt"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )
+    _flush_session_logs()
+    # DirEntry caches its stat result, so each file is stat'ed once
+    with os.scandir(settings.recordings_dir) as it:
+        log_files = [entry for entry in it if entry.name.endswith(".txt")]
+    log_files.sort(key=lambda e: e.stat().st_mtime, reverse=True)
     
     logs_info = []
     for log_file in log_files:
+        log_stat = log_file.stat()
         try:
-            # Read first few lines to get session info
-            with open(log_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-                entry_count = len([l for l in lines if l.startswith("[")])
-                first_entry = lines[0].strip() if lines else "No entries"
+            entry_count = _session_log_entry_count(log_file.path, log_stat.st_size)
+            first_entry = _read_first_line(log_file.path)
         except Exception as e:
             logger.warning(f"Error reading log file {log_file.name}: {e}")
             entry_count = 0
             first_entry = "Error reading file"
         
         logs_info.append({
-            "session_id": log_file.stem,
+            "session_id": log_file.name[:-len(".txt")],
             "filename": log_file.name,
-            "size": log_file.stat().st_size,
-            "modified": datetime.fromtimestamp(log_file.stat().st_mtime).isoformat(),
+            "size": log_stat.st_size,
+            "modified": datetime.fromtimestamp(log_stat.st_mtime).isoformat(),
             "entry_count": entry_count,
             "first_entry": first_entry,
         })
@@ -262,15 +814,10 @@ async def list_transcription_logs():
 
 
 @app.get("/transcription-logs/{session_id}")
-async def get_transcription_log(session_id: str):
+def get_transcription_log(session_id: str):
     """Get the full content of a specific session log file"""
-    if not RECORDINGS_DIR.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Recordings directory not found",
-        )
-    
-    log_file = RECORDINGS_DIR / f"{session_id}.txt"
+    _flush_session_logs(session_id)
+    log_file = settings.recordings_dir / f"{session_id}.txt"
     
     if not log_file.exists():
         raise HTTPException(
@@ -298,41 +845,42 @@ async def get_transcription_log(session_id: str):
 
 
 @app.get("/recordings/{filename}")
-async def get_recording_file(filename: str):
+def get_recording_file(filename: str):
     """Download/serve a specific audio recording file"""
-    if not RECORDINGS_DIR.exists():
+    # Security: prevent path traversal
+    if _INVALID_FILENAME_RE.search(filename):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Recordings directory not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid filename",
         )
     
-    # Security: prevent path traversal
-    if ".." in filename or "/" in filename or "\\" in filename:
+    # Validate it's an audio file
+    if not filename.lower().endswith(ALLOWED_AUDIO_EXTENSIONS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid filename",
+            detail="Invalid file type",
         )
     
-    file_path = RECORDINGS_DIR / filename
+    file_path = settings.recordings_dir / filename
     
-    if not file_path.exists():
+    try:
+        # Reused by the response so the file is only stat'ed once
+        stat_result = file_path.stat()
+    except OSError:
+        # Missing, a symlink loop (ELOOP) or under a non-directory (ENOTDIR)
+        stat_result = None
+    # Passing stat_result skips FileResponse's own regular-file check, so do it here
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Recording file {filename} not found",
         )
     
-    # Validate it's an audio file
-    allowed_extensions = {".webm", ".opus", ".ogg", ".wav", ".m4a"}
-    if file_path.suffix.lower() not in allowed_extensions:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file type",
-        )
-    
-    return FileResponse(
+    return RecordingFileResponse(
         path=str(file_path),
         filename=filename,
-        media_type="audio/webm" if file_path.suffix == ".webm" else "audio/ogg"
+        media_type="audio/webm" if filename.endswith(".webm") else "audio/ogg",
+        stat_result=stat_result,
     )
 
 